@@ -1,15 +1,37 @@
-import os
 import re
-import json
+import csv
 import argparse
+import ahocorasick
+import numpy as np
+import orjson
 import pandas as pd
-from urllib.parse import urlparse
-from openpyxl.utils import get_column_letter
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.json as paj
+import xlsxwriter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from urllib.parse import urlparse, uses_params
 
 # --------------------------
 # Constants
 # --------------------------
+# Control characters Excel rejects: the regex only detects them, the
+# str.translate table deletes them
 _ILLEGAL_CHARS_RE = re.compile(r"[\x00-\x08\x0B-\x0C\x0E-\x1F]")
+_ILLEGAL_CHARS_TABLE = dict.fromkeys(
+    [*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20)]
+)
+# Scheme, netloc and path the way urlparse splits them (RFC 3986, appendix B)
+_URL_PARTS_RE = re.compile(
+    r"^(?:(?P<scheme>[A-Za-z][A-Za-z0-9+.\-]*):)?(?://(?P<netloc>[^/?#]*))?(?P<path>[^?#]*)"
+)
+_URL_PARAMS_RE = re.compile(r";[^/]*$")
+# Characters urlparse drops before splitting a URL
+_URL_UNSAFE_CHARS_RE = re.compile(r"[\t\r\n]")
+_URL_LEADING_STRIP_CHARS = "".join(map(chr, range(0x21)))
+# Last suffix of the final path segment, ignoring leading dots like os.path.splitext
+_PATH_EXTENSION_RE = re.compile(r"(?:^|/)\.*[^./][^/]*(\.[^./]*)$")
 
 CRITICAL_SERVICES = {
     21: (
@@ -138,6 +160,17 @@ CRITICAL_SERVICES = {
     11211: ("Memcached", "Caching service", "No auth; data exposure risk"),
 }
 
+# Sorted port numbers with their formatted descriptions, for np.searchsorted
+_PORT_KEYS = np.array(sorted(CRITICAL_SERVICES), dtype=np.int32)
+_PORT_DESCRIPTIONS = np.array(
+    [
+        "{} - {}. Risk: {}".format(*CRITICAL_SERVICES[port])
+        for port in _PORT_KEYS.tolist()
+    ]
+    + ["Standard port/service"],
+    dtype=object,
+)
+
 ENDPOINT_CATEGORIES = [
     {
         "name": "Sensitive or high-risk endpoint",
@@ -272,128 +305,278 @@ ENDPOINT_CATEGORIES = [
     {"name": "Monitoring/Health endpoint", "list": ["/status", "/info"], "rank": 10},
 ]
 
-SEVERITY_ORDER = {
-    "critical": 1,
-    "high": 2,
-    "medium": 3,
-    "low": 4,
-    "info": 5,
-    "unknown": 6,
-}
+
+def _build_endpoint_automaton():
+    # Keywords shared by several categories keep the highest-priority one.
+    automaton = ahocorasick.Automaton()
+    for priority, category in enumerate(ENDPOINT_CATEGORIES):
+        for keyword in category["list"]:
+            if keyword not in automaton:
+                automaton.add_word(keyword, priority)
+    automaton.make_automaton()
+    return automaton
+
+
+_ENDPOINT_AUTOMATON = _build_endpoint_automaton()
+# Indexed by category priority; the extra last slot is the no-match fallback
+_ENDPOINT_NAMES = np.array(
+    [category["name"] for category in ENDPOINT_CATEGORIES]
+    + ["Generic or static-looking endpoint"],
+    dtype=object,
+)
+_ENDPOINT_RANKS = np.array(
+    [category["rank"] for category in ENDPOINT_CATEGORIES] + [0], dtype=np.int64
+)
+
+SEVERITY_ORDER = ["critical", "high", "medium", "low", "info", "unknown"]
+
+# Only the Nuclei fields the sheet shows; anything else is ignored by the reader
+_VULN_PARSE_OPTIONS = paj.ParseOptions(
+    explicit_schema=pa.schema(
+        [
+            ("template-id", pa.string()),
+            ("info", pa.struct([("name", pa.string()), ("severity", pa.string())])),
+            ("type", pa.string()),
+            ("host", pa.string()),
+            ("url", pa.string()),
+            ("matched-at", pa.string()),
+            ("extracted-results", pa.list_(pa.string())),
+        ]
+    ),
+    unexpected_field_behavior="ignore",
+)
 
 
 # --------------------------
 # Helpers
 # --------------------------
-def sanitize_excel(s):
-    return _ILLEGAL_CHARS_RE.sub("", s) if isinstance(s, str) else s
-
-def autosize_columns(ws):
-    for col in ws.columns:
-        max_len = max((len(str(cell.value)) for cell in col if cell.value), default=0)
-        ws.column_dimensions[get_column_letter(col[0].column)].width = max_len + 2
-
-def port_reason(port):
-    if port in CRITICAL_SERVICES:
-        name, function, risk = CRITICAL_SERVICES[port]
-        return f"{name} - {function}. Risk: {risk}"
-    return "Standard port/service"
-
-def endpoint_reason(path):
-    path = path.lower()
-    for category in ENDPOINT_CATEGORIES:
-        if any(keyword in path for keyword in category["list"]):
-            return category["name"], category["rank"]
-    return "Generic or static-looking endpoint", 0
+def column_widths(df):
+    widths = []
+    for name, col in df.items():
+        # Width by string length, measured column-wise rather than per cell
+        values = col.dropna()
+        if not pd.api.types.is_string_dtype(values):
+            values = values.astype(str)
+        lengths = values.str.len()
+        widths.append(max(len(str(name)), int(lengths.max()) if len(lengths) else 0))
+    return widths
+
+def write_sheet(wb, sheet, df):
+    ws = wb.add_worksheet(sheet)
+    ws.write_row(0, 0, [str(h) for h in df.columns], wb.add_format({"bold": True}))
+    # constant_memory flushes each row as it is written; column widths are
+    # only emitted on close, so setting them up front costs nothing.
+    for i, width in enumerate(column_widths(df)):
+        ws.set_column(i, i, width + 2)
+    # Columns become plain object arrays (categoricals expanded, NaN as None,
+    # which xlsxwriter leaves blank) and are typed once, not per cell.
+    columns = [col.to_numpy(dtype=object, na_value=None) for _, col in df.items()]
+    is_text = [pd.api.types.infer_dtype(c) in ("string", "empty") for c in columns]
+    write_string, write = ws.write_string, ws.write
+    for row_idx, row in enumerate(zip(*columns), 1):
+        for i, v in enumerate(row):
+            if is_text[i]:
+                if v:
+                    write_string(row_idx, i, v)
+            elif v is not None:
+                write(row_idx, i, v)
+
+def _is_parseable(url):
+    try:
+        urlparse(url)
+    except ValueError:
+        return False
+    return True
+
+def port_descriptions(ports):
+    # Ports missing from the table point at the trailing default description
+    idx = np.searchsorted(_PORT_KEYS, ports)
+    found = _PORT_KEYS[np.minimum(idx, len(_PORT_KEYS) - 1)] == ports
+    return _PORT_DESCRIPTIONS[np.where(found, idx, len(_PORT_KEYS))]
+
+def endpoint_reasons(paths_lower):
+    # One automaton pass over all paths joined by newlines (which no keyword or
+    # path contains); match end offsets are mapped back to their row. Lengths
+    # and the joined text come from Arrow kernels, and matches are flattened
+    # straight into numpy, so no Python object is built per path.
+    row_ends = np.cumsum(paths_lower.str.len().to_numpy(dtype=np.int64) + 1)
+    best = np.full(len(paths_lower), len(ENDPOINT_CATEGORIES), dtype=np.int64)
+    text = paths_lower.str.cat(sep="\n")
+    matches = np.fromiter(
+        chain.from_iterable(_ENDPOINT_AUTOMATON.iter(text)), dtype=np.int64
+    )
+    if len(matches):
+        ends, priorities = matches.reshape(-1, 2).T
+        np.minimum.at(best, np.searchsorted(row_ends, ends, side="right"), priorities)
+    return _ENDPOINT_NAMES[best], _ENDPOINT_RANKS[best]
 
 # --------------------------
 # Loaders
 # --------------------------
+def read_whitespace_table(file_path, names, **kwargs):
+    try:
+        return pd.read_csv(
+            file_path,
+            sep=r"\s+",
+            header=None,
+            names=names,
+            dtype=str,
+            engine="c",
+            quoting=csv.QUOTE_NONE,
+            keep_default_na=False,
+            **kwargs,
+        )
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame({name: pd.Series(dtype=str) for name in names})
+
+
 def load_subdomains(file_path):
-    rows = [
-        {"Subdomain": p[0], "IP": p[1]}
-        for line in open(file_path)
-        if (p := line.strip().split()) and len(p) >= 2
-    ]
-    return pd.DataFrame(rows)
+    df = read_whitespace_table(file_path, ["Subdomain", "IP"], usecols=[0, 1])
+    return df[df["IP"] != ""].reset_index(drop=True)
 
 
 def load_ports(file_path):
-    rows = []
-    for line in open(file_path):
-        if not line.strip() or line.startswith("#"):
-            continue
-        parts = line.split()
-        if len(parts) == 3:
-            ip, port_str, service = parts
-            port = int(port_str)
-            rows.append(
-                {
-                    "IP": ip,
-                    "Port": port,
-                    "Service": service,
-                    "Description": port_reason(port),
-                }
-            )
-    return pd.DataFrame(rows)
+    # The spare column catches 4-field lines; wider ones are dropped by the parser
+    df = read_whitespace_table(
+        file_path, ["IP", "Port", "Service", "_extra"], on_bad_lines="skip"
+    )
+    df = df[
+        (df["Service"] != "") & (df["_extra"] == "") & ~df["IP"].str.startswith("#")
+    ].drop(columns=["_extra"])
+    df["Port"] = df["Port"].astype("int64")
+    df["Description"] = port_descriptions(df["Port"].to_numpy())
+    df[["Service", "Description"]] = df[["Service", "Description"]].astype("category")
+    return df.reset_index(drop=True)
 
 
 def load_endpoints(file_path):
-    rows = []
-    for line in open(file_path, encoding="utf-8", errors="ignore"):
-        url = line.strip().strip('"').strip("’")
-        if not url:
-            continue
-        try:
-            parsed = urlparse(url)
-            reason, score = endpoint_reason(parsed.path or "/")
-            rows.append(
-                {
-                    "URL (Endpoint)": sanitize_excel(url),
-                    "Protocol": sanitize_excel(parsed.scheme.upper()),
-                    "File Extension": sanitize_excel(
-                        os.path.splitext(parsed.path or "/")[1].lower().lstrip(".")
-                        or "none"
-                    ),
-                    "Reason to Test First": sanitize_excel(reason),
-                    "Rank": score,
-                }
-            )
-        except Exception:
-            rows.append(
-                {
-                    "URL (Endpoint)": sanitize_excel(url),
-                    "Protocol": "Unknown",
-                    "File Extension": "error",
-                    "Reason to Test First": "Could not parse URL",
-                    "Rank": 0,
-                }
-            )
-    return pd.DataFrame(rows).sort_values(by="Rank", ascending=False)
+    with open(file_path, encoding="utf-8", errors="ignore") as f:
+        text = f.read()
+    # Endpoint lists rarely contain control characters; one scan of the raw
+    # text lets the common case skip sanitizing the columns altogether.
+    has_illegal_chars = _ILLEGAL_CHARS_RE.search(text) is not None
+    # Arrow-backed strings let the str ops below run as Arrow compute kernels
+    urls = pd.Series(text.split("\n"), dtype=pd.StringDtype("pyarrow"))
+    urls = urls.str.strip().str.strip('"').str.strip("’")
+    urls = urls[urls != ""]
+    # The same URL is often reported by several tools; parse and list it once
+    unique_urls = urls.drop_duplicates()
+    if len(unique_urls) < len(urls):
+        print(f"[*] Dropped {len(urls) - len(unique_urls)} duplicate endpoints")
+    urls = unique_urls.reset_index(drop=True)
+
+    parts = (
+        urls.str.replace(_URL_UNSAFE_CHARS_RE, "", regex=True)
+        .str.lstrip(_URL_LEADING_STRIP_CHARS)
+        .str.extract(_URL_PARTS_RE)
+    )
+    scheme = parts["scheme"].fillna("").str.lower()
+    # Only bracketed (IPv6) netlocs can make urlparse raise; let it judge those
+    bracketed = parts["netloc"].fillna("").str.contains(r"[\[\]]", regex=True)
+    invalid = pd.Series(False, index=urls.index)
+    if bracketed.any():
+        invalid[bracketed] = [not _is_parseable(url) for url in urls[bracketed]]
+
+    paths = parts["path"].mask(
+        scheme.isin(uses_params),
+        parts["path"].str.replace(_URL_PARAMS_RE, "", regex=True),
+    )
+    paths_lower = paths.mask(paths == "", "/").str.lower()
+    extensions = paths_lower.str.extract(_PATH_EXTENSION_RE)[0].str[1:]
+    extensions = extensions.mask(extensions.isna() | (extensions == ""), "none")
+    if has_illegal_chars:
+        urls = urls.str.translate(_ILLEGAL_CHARS_TABLE)
+        extensions = extensions.str.translate(_ILLEGAL_CHARS_TABLE)
+    reasons, ranks = endpoint_reasons(paths_lower)
+
+    df = pd.DataFrame(
+        {
+            "URL (Endpoint)": urls,
+            "Protocol": scheme.str.upper().mask(invalid, "Unknown"),
+            "File Extension": extensions.mask(invalid, "error"),
+            "Reason to Test First": pd.Series(reasons).mask(
+                invalid, "Could not parse URL"
+            ),
+            "Rank": pd.Series(ranks).mask(invalid, 0),
+        }
+    )
+    # Low-cardinality labels are stored once per distinct value
+    labels = ["Protocol", "File Extension", "Reason to Test First"]
+    df[labels] = df[labels].astype("category")
+    # Ranks fit in int8, for which numpy's stable argsort is an O(n) radix sort
+    order = np.argsort(-df["Rank"].to_numpy(dtype=np.int8), kind="stable")
+    return df.take(order)
+
+
+def read_vulnerabilities_arrow(file_path):
+    # One multithreaded C++ pass straight into columns
+    table = paj.read_json(file_path, parse_options=_VULN_PARSE_OPTIONS)
+    info = table.column("info")
+    columns = {
+        "Template ID": table.column("template-id"),
+        "Template Name": pc.struct_field(info, "name"),
+        "Type": table.column("type"),
+        "Severity": pc.struct_field(info, "severity"),
+        "Host": table.column("host"),
+        "Url": table.column("url"),
+        "Matcher": table.column("matched-at"),
+        "Results": pc.binary_join(table.column("extracted-results"), ", "),
+    }
+    return {name: column.fill_null("").to_pandas() for name, column in columns.items()}
+
+
+def read_vulnerabilities_lines(file_path):
+    with open(file_path, "rb") as f:
+        lines = [line for line in f.read().splitlines() if line.strip()]
+    # Parse the whole file as one JSON array; any malformed line makes this fail
+    # (or change the record count), in which case lines are parsed one by one.
+    try:
+        records = orjson.loads(b"[" + b",".join(lines) + b"]")
+    except orjson.JSONDecodeError:
+        records = None
+    if records is None or len(records) != len(lines):
+        records = []
+        for line in lines:
+            try:
+                records.append(orjson.loads(line))
+            except orjson.JSONDecodeError:
+                continue
+    infos = [r.get("info") or {} for r in records]
+    return {
+        "Template ID": [r.get("template-id", "") for r in records],
+        "Template Name": [info.get("name", "") for info in infos],
+        "Type": [r.get("type", "") for r in records],
+        "Severity": [info.get("severity", "") for info in infos],
+        "Host": [r.get("host", "") for r in records],
+        "Url": [r.get("url", "") for r in records],
+        "Matcher": [r.get("matched-at", "") for r in records],
+        "Results": [
+            ", ".join(r.get("extracted-results", []) or []) for r in records
+        ],
+    }
 
 
 def load_vulnerabilities(file_path):
-    rows = []
-    for line in open(file_path):
-        try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        rows.append(
-            {
-                "Template ID": data.get("template-id", ""),
-                "Template Name": data.get("info", {}).get("name", ""),
-                "Type": data.get("type", ""),
-                "Severity": data.get("info", {}).get("severity", ""),
-                "Host": data.get("host", ""),
-                "Url": data.get("url", ""),
-                "Matcher": data.get("matched-at", ""),
-                "Results": ", ".join(data.get("extracted-results", []) or []),
-            }
-        )
-    df = pd.DataFrame(rows)
-    df["Severity Rank"] = df["Severity"].map(lambda s: SEVERITY_ORDER.get(s, 99))
-    return df.sort_values(by="Severity Rank").drop(columns=["Severity Rank"])
+    # The Arrow reader rejects the whole file on a malformed line or a field of
+    # an unexpected type; those files go through the per-line orjson path.
+    try:
+        columns = read_vulnerabilities_arrow(file_path)
+    except pa.ArrowInvalid:
+        columns = read_vulnerabilities_lines(file_path)
+    df = pd.DataFrame(columns)
+    # Repeated findings share template, host and match; distinct extracted
+    # results are kept apart
+    deduped = df.drop_duplicates(subset=["Template ID", "Host", "Matcher", "Results"])
+    if len(deduped) < len(df):
+        print(f"[*] Dropped {len(df) - len(deduped)} duplicate vulnerabilities")
+    df = deduped
+    df["Type"] = df["Type"].astype("category")
+    # Severities outside SEVERITY_ORDER sort after it, in order of appearance
+    extra = [s for s in df["Severity"].dropna().unique() if s not in SEVERITY_ORDER]
+    df["Severity"] = df["Severity"].astype(
+        pd.CategoricalDtype(SEVERITY_ORDER + extra, ordered=True)
+    )
+    return df.sort_values(by="Severity", kind="stable")
 
 
 # --------------------------
@@ -402,16 +585,32 @@ def load_vulnerabilities(file_path):
 def generate_dashboard(
     subdomain_file, port_file, endpoint_file, vuln_file, output_excel
 ):
-    dfs = {
-        "Domain": load_subdomains(subdomain_file),
-        "Ports": load_ports(port_file),
-        "Endpoints": load_endpoints(endpoint_file),
-        "Vulnerabilities": load_vulnerabilities(vuln_file),
+    loaders = {
+        "Domain": (load_subdomains, subdomain_file),
+        "Ports": (load_ports, port_file),
+        "Endpoints": (load_endpoints, endpoint_file),
+        "Vulnerabilities": (load_vulnerabilities, vuln_file),
     }
-    with pd.ExcelWriter(output_excel, engine="openpyxl") as writer:
-        for sheet, df in dfs.items():
-            df.to_excel(writer, sheet_name=sheet, index=False)
-            autosize_columns(writer.book[sheet])
+    # The loaders are independent and spend most of their time in file reads
+    # and pandas/orjson C code, so they overlap well on threads.
+    with ThreadPoolExecutor(max_workers=len(loaders)) as executor:
+        futures = {
+            sheet: executor.submit(loader, path)
+            for sheet, (loader, path) in loaders.items()
+        }
+        dfs = {sheet: future.result() for sheet, future in futures.items()}
+    wb = xlsxwriter.Workbook(
+        output_excel,
+        {
+            "constant_memory": True,
+            "strings_to_formulas": False,
+            "strings_to_numbers": False,
+            "strings_to_urls": False,
+        },
+    )
+    for sheet, df in dfs.items():
+        write_sheet(wb, sheet, df)
+    wb.close()
     print(f"[+] Excel dashboard generated: {output_excel}")
 
 
@@ -1,7 +1,7 @@
 """
 URL Validator and HTML Dumper using undetected-chromedriver
 
-This script takes a list of URLs and visits them using a headless browser.
+This script takes a list of URLs and visits them using Chrome (optionally headless).
 It checks for fake 404 pages (based on keywords), WAF challenges, and repeated
 failures based on URL patterns. It also optionally saves valid HTML responses
 and supports skipping redundant checks based on path patterns.
@@ -11,23 +11,37 @@ Author: YourName (You can replace with your name)
 
 import sys
 import time
+import asyncio
 import argparse
 import logging
 import random
 import hashlib
+import json
 import os
 import re
-from typing import List, Optional, Tuple
-from collections import defaultdict, deque
-from urllib.parse import urlparse
-from fnmatch import fnmatch
-
+import queue
+import socket
+import shutil
+import tempfile
+import threading
+from multiprocessing import Process, Queue
+from typing import List, Optional, TextIO, Tuple
+from functools import lru_cache
+from urllib.parse import ParseResult, urlparse
+from fnmatch import translate as translate_glob
+
+import httpx
+import blake3
 import undetected_chromedriver as uc
 from tqdm import tqdm
 
 # Default configuration
 DEFAULT_NOT_FOUND_KEYWORDS = ["404", "not found", "tidak ditemukan"]
 DEFAULT_DRIVER_PATH = "/usr/local/bin/chromedriver"
+POOL_SOCKET_ENV = "RECON_POOL_SOCKET"
+# Outcomes that hold for every URL sharing a prefix + path; transient ones
+# (WAF blocks, timeouts and other errors) are checked again
+CACHEABLE_STATUSES = {"ok", "not_found", "dns_error"}
 SKIP_PATTERNS = ["*/id/*", "*/en/*", "*category*", "*tag*", ]
 ERROR_SIGNATURES = [
     "ERR_EMPTY_RESPONSE",
@@ -36,6 +50,51 @@ ERROR_SIGNATURES = [
     "net::ERR_EMPTY_RESPONSE",
     "Error code: ERR_EMPTY_RESPONSE",
 ]
+ERROR_SIGNATURES_RE = re.compile("|".join(map(re.escape, ERROR_SIGNATURES)), re.IGNORECASE)
+WAF_CHALLENGE_RE = re.compile("one moment", re.IGNORECASE)
+# Runs the page checks inside the browser so only a small summary crosses
+# the DevTools connection instead of the whole serialized page
+SNIFF_SCRIPT = """
+const root = document.documentElement;
+const html = root ? root.outerHTML.trim() : "";
+const waf = new RegExp(arguments[1], "i");
+return {
+    title: document.title,
+    head: html.slice(0, 100),
+    error: !html || new RegExp(arguments[0], "i").test(html),
+    waf: waf.test(document.title) || waf.test(html),
+};
+"""
+# Fetches a batch of same-origin URLs from the current page; null marks
+# network and CORS failures
+FETCH_SCRIPT = """
+const [urls, keepSource, sniffLength, done] = arguments;
+Promise.all(urls.map(url => fetch(url, {credentials: "include"}).then(async response => {
+    const text = await response.text();
+    return {
+        status: response.status,
+        mitigated: response.headers.get("cf-mitigated"),
+        text: keepSource ? text : text.slice(0, sniffLength),
+    };
+}).catch(() => null))).then(done);
+"""
+# Resources a not-found check never needs; stylesheets are added with --block-css
+BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*.mp4", "*.webm", "*.mp3",
+]
+HTTP_CONCURRENCY = 64
+# Bytes of a response body read to classify it; the rest is only read to dump ok pages
+HTTP_SNIFF_BYTES = 16 * 1024
+# getaddrinfo errors meaning the host does not exist (as opposed to a flaky resolver)
+DEAD_HOST_ERRORS = {socket.EAI_NONAME, getattr(socket, "EAI_NODATA", socket.EAI_NONAME)}
+HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+# HTTP probe outcomes that only a real browser can settle
+BROWSER_STATUSES = {"waf_blocked", "js_required"}
+HTTP_CHALLENGE_RE = re.compile("one moment|cf-challenge", re.IGNORECASE)
+JS_REQUIRED_RE = re.compile("enable javascript|javascript is required", re.IGNORECASE)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.IGNORECASE | re.DOTALL)
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Argument Parsing and Logger Setup
@@ -48,13 +107,22 @@ def parse_args():
     parser = argparse.ArgumentParser(description="Check URLs using Selenium.")
     parser.add_argument("-i", "--input", required=True, help="Input file with list of URLs")
     parser.add_argument("-o", "--output", help="File to save valid (non-404) URLs")
-    parser.add_argument("-d", "--delay", type=int, default=1, help="Initial delay between requests (default: 1)")
+    parser.add_argument("-d", "--delay", type=int, default=1, help="Initial delay between requests once a WAF challenge was seen (default: 1)")
     parser.add_argument("--timeout", type=int, default=10, help="Page load timeout in seconds (default: 10)")
     parser.add_argument("--not-found-keywords", type=str, help="Comma-separated keywords to detect 'not found' pages")
     parser.add_argument("--driver-path", type=str, help=f"Path to ChromeDriver (default: {DEFAULT_DRIVER_PATH})")
     parser.add_argument("--retries", type=int, default=2, help="Number of retries on failure (default: 2)")
     parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
     parser.add_argument("--html-dump-dir", type=str, help="Directory to save raw HTML of each successful page")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="Number of parallel browser processes (default: 1)")
+    parser.add_argument("--tabs", type=int, default=1, help="Pages each browser loads at once in background tabs (default: 1)")
+    parser.add_argument("--http-probe", action="store_true", help="Check URLs over plain HTTP first; only WAF/JS-gated pages and errors go to Chrome")
+    parser.add_argument("--http-only", action="store_true", help="Check URLs over plain HTTP only, without starting Chrome")
+    parser.add_argument("--block-css", action="store_true", help="Also block stylesheets (faster, but pages render unstyled)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless (faster, but easier for WAFs to spot)")
+    parser.add_argument("--browser-path", type=str, help="Chrome binary to use, e.g. chrome-headless-shell")
+    parser.add_argument("--in-page-fetch", action="store_true", help="Check each batch of --tabs URLs with fetch() from a page on their origin instead of loading every page")
+    parser.add_argument("--pin-dns", action="store_true", help="Reuse the up-front DNS lookups in Chrome instead of resolving hosts again")
     return parser.parse_args()
 
 def setup_logging(verbose: bool):
@@ -74,11 +142,51 @@ def load_urls(filepath: str) -> List[str]:
     """
     try:
         with open(filepath, "r", encoding="utf-8") as f:
-            return [line.strip() for line in f if line.strip()]
+            return list(dict.fromkeys(url for line in f if (url := line.strip())))
     except FileNotFoundError:
         logging.error(f"[!] File not found: {filepath}")
         sys.exit(1)
 
+def clean_path(parsed: ParseResult) -> str:
+    """
+    Returns the path of a parsed URL without embedded query-like
+    parameters or garbage from malformed URLs, like '/foo/bar'.
+    """
+    return re.split(r'[&;?]', parsed.path, maxsplit=1)[0].rstrip("/")
+
+def prefix_of(parsed: ParseResult, path: str) -> str:
+    """
+    Returns the common prefix of a parsed URL whose path was cleaned by
+    clean_path(). See get_common_prefix().
+    """
+    path_parts = [p for p in path.strip("/").split("/") if p]
+
+    if len(path_parts) >= 2:
+        prefix_path = "/".join(path_parts[:-1])
+        return f"{parsed.scheme}://{parsed.netloc}/{prefix_path}"
+    elif path_parts:
+        return f"{parsed.scheme}://{parsed.netloc}/{path_parts[0]}"
+    else:
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+def url_origin(url: str) -> Optional[str]:
+    """
+    Returns the origin of a URL as the browser reports it: lowercase scheme
+    and host, without the scheme's default port. None for URLs without a host
+    or with an invalid port.
+    """
+    try:
+        parsed = urlparse(url)
+        port = parsed.port
+    except ValueError:
+        return None
+    if not parsed.hostname:
+        return None
+    scheme = parsed.scheme.lower()
+    host = f"[{parsed.hostname}]" if ":" in parsed.hostname else parsed.hostname
+    if port and port != {"http": 80, "https": 443}.get(scheme):
+        host += f":{port}"
+    return f"{scheme}://{host}"
 
 def get_path_without_query(url: str) -> str:
     """
@@ -91,8 +199,7 @@ def get_path_without_query(url: str) -> str:
     Returns:
         str: The cleaned path, like '/foo/bar'
     """
-    parsed = urlparse(url)
-    return re.split(r'[&;?]', parsed.path, maxsplit=1)[0].rstrip("/")
+    return clean_path(urlparse(url))
 
 
 def get_common_prefix(url: str) -> str:
@@ -111,34 +218,56 @@ def get_common_prefix(url: str) -> str:
         str: Prefix like 'https://example.com/blog/article'
     """
     parsed = urlparse(url)
-    clean_path = get_path_without_query(url)
-    path_parts = [p for p in clean_path.strip("/").split("/") if p]
+    return prefix_of(parsed, clean_path(parsed))
 
-    if len(path_parts) >= 2:
-        prefix_path = "/".join(path_parts[:-1])
-        return f"{parsed.scheme}://{parsed.netloc}/{prefix_path}"
-    elif path_parts:
-        return f"{parsed.scheme}://{parsed.netloc}/{path_parts[0]}"
-    else:
-        return f"{parsed.scheme}://{parsed.netloc}"
+@lru_cache(maxsize=None)
+def skip_regex(skip_patterns: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compiles fnmatch-style skip patterns into one alternation.
+    """
+    return re.compile("|".join(map(translate_glob, skip_patterns)) or "(?!)")
 
 def should_skip_path(url: str, skip_patterns: List[str]) -> bool:
     """
     Checks if a URL path matches any skip pattern (e.g., */tag/*).
     """
-    parsed = urlparse(url)
-    return any(fnmatch(parsed.path, pattern) for pattern in skip_patterns)
+    return skip_regex(tuple(skip_patterns)).match(urlparse(url).path) is not None
+
+def url_key(parsed: ParseResult, skip_patterns: List[str]) -> Optional[Tuple[str, str]]:
+    """
+    Returns a parsed URL's (common prefix, cleaned path) key, or None when its
+    path matches a skip pattern. Equivalent to should_skip_path(),
+    get_common_prefix() and get_path_without_query() together.
+    """
+    if skip_regex(tuple(skip_patterns)).match(parsed.path):
+        return None
+    path = clean_path(parsed)
+    return prefix_of(parsed, path), path
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Selenium Driver Setup and Response Handling
 # ────────────────────────────────────────────────────────────────────────────────
 
-def setup_driver(timeout: int, driver_path: Optional[str] = None) -> uc.Chrome:
+def setup_driver(
+    timeout: int,
+    driver_path: Optional[str] = None,
+    user_data_dir: Optional[str] = None,
+    block_css: bool = False,
+    headless: bool = False,
+    browser_path: Optional[str] = None,
+    host_rules: Optional[str] = None,
+) -> uc.Chrome:
     """
-    Sets up a headless Chrome WebDriver with image loading disabled.
+    Sets up a Chrome WebDriver with images, fonts and media blocked, and
+    stylesheets too when block_css is set. Runs headless when asked, and can
+    use another Chrome build such as chrome-headless-shell via browser_path.
+    host_rules, when given, is passed as --host-resolver-rules.
+    A user data dir, when given, keeps the browser cache between runs.
     """
     options = uc.ChromeOptions()
     prefs = {"profile.managed_default_content_settings.images": 2}
+    if block_css:
+        prefs["profile.managed_default_content_settings.stylesheets"] = 2
     options.add_experimental_option("prefs", prefs)
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
@@ -146,50 +275,113 @@ def setup_driver(timeout: int, driver_path: Optional[str] = None) -> uc.Chrome:
     options.add_argument("--disable-extensions")
     options.add_argument("--ignore-certificate-errors")
     options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-remote-fonts")
+    options.add_argument("--mute-audio")
+    options.add_argument("--aggressive-cache-discard")
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if host_rules:
+        options.add_argument(f"--host-resolver-rules={host_rules}")
 
     path_to_use = driver_path if driver_path else DEFAULT_DRIVER_PATH
     try:
-        driver = uc.Chrome(options=options, driver_executable_path=path_to_use)
+        driver = uc.Chrome(
+            options=options,
+            driver_executable_path=path_to_use,
+            browser_executable_path=browser_path,
+            headless=headless,
+        )
         driver.set_page_load_timeout(timeout)
+        block_resources(driver, block_css)
         return driver
     except Exception as e:
         logging.error(f"[!] ERROR during driver setup using path '{path_to_use}': {e}")
         sys.exit(1)
 
+def block_resources(driver: uc.Chrome, block_css: bool = False):
+    """
+    Blocks BLOCKED_RESOURCES, plus stylesheets when block_css is set, in the
+    current tab. The block is per tab, so new tabs need their own call.
+    """
+    blocked = BLOCKED_RESOURCES + (["*.css"] if block_css else [])
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+
+def copy_driver(driver_path: str) -> str:
+    """
+    Copies the ChromeDriver binary into a private temp directory.
+    undetected-chromedriver patches the binary in place, so browsers sharing
+    one file fail with "Text file busy".
+    """
+    try:
+        return shutil.copy2(driver_path, tempfile.mkdtemp(prefix="chromedriver_"))
+    except OSError as e:
+        logging.error(f"[!] ERROR copying driver '{driver_path}': {e}")
+        sys.exit(1)
+
+@lru_cache(maxsize=None)
+def keywords_regex(keywords: Tuple[str, ...]) -> re.Pattern:
+    """
+    Compiles 'not found' keywords into one case-insensitive alternation.
+    """
+    return re.compile("|".join(map(re.escape, keywords)) or "(?!)", re.IGNORECASE)
+
 def is_not_found(title: str, source: str, keywords: List[str]) -> bool:
     """
     Determines if the page source and title indicate a 404 or 'not found' page.
     """
-    content = f"{title} {source}".lower()
-    return any(keyword.lower() in content for keyword in keywords)
+    return keywords_regex(tuple(keywords)).search(f"{title} {source}") is not None
 
-def check_url(driver: uc.Chrome, url: str, delay: int, keywords: List[str], retries: int = 3) -> Tuple[str, int, Optional[str]]:
+def sniff_page(driver: uc.Chrome) -> dict:
+    """
+    Inspects the current page in the browser and returns its title, the first
+    100 characters of its HTML and whether it shows an error or WAF signature.
+    """
+    return driver.execute_script(SNIFF_SCRIPT, ERROR_SIGNATURES_RE.pattern, WAF_CHALLENGE_RE.pattern)
+
+def classify_page(page: dict, keywords: List[str]) -> Optional[str]:
+    """
+    Classifies a page sniffed by sniff_page as "empty_response", "not_found"
+    or "ok". Returns None for a WAF challenge ("one moment" page), which needs
+    a retry.
+    """
+    if page["error"]:
+        return "empty_response"
+    if page["waf"]:
+        return None
+    if is_not_found(page["title"], page["head"], keywords):
+        return "not_found"
+    return "ok"
+
+def check_url(driver: uc.Chrome, url: str, delay: int, keywords: List[str], retries: int = 3, keep_source: bool = True, waf_streak: int = 0) -> Tuple[str, int, Optional[str]]:
     """
     Attempts to load a URL and returns a status, updated delay, and page source.
+    The source is only fetched for "ok" pages, and only when keep_source is set.
+    Waits a random part of the delay after loading only while the site is
+    pushing back: waf_streak is the number of URLs in a row that ended up
+    "waf_blocked", and a challenge during this check counts too.
     Statuses: "ok", "not_found", "waf_blocked", "empty_response", or "error:*"
     """
     for attempt in range(1, retries + 1):
         try:
             driver.get(url)
-            time.sleep(random.uniform(0, delay))
+            if waf_streak or attempt > 1:
+                time.sleep(random.uniform(0, delay))
 
-            title = driver.title
-            source = driver.page_source.strip()
-
-            if not source or any(sig.lower() in source.lower() for sig in ERROR_SIGNATURES):
-                return "empty_response", delay, None
+            status = classify_page(sniff_page(driver), keywords)
+            if status == "empty_response":
+                return status, delay, None
 
-            if "one moment" in title.lower() or "one moment" in source.lower():
+            if status is None:
                 delay = min(delay + 2, 15)
                 time.sleep(delay)
                 if attempt >= retries:
                     return "waf_blocked", delay, None
                 continue
 
-            if is_not_found(title, source[:100], keywords):
-                return "not_found", max(delay - 1, 1), source
-
-            return "ok", max(delay - 1, 1), source
+            source = driver.page_source.strip() if status == "ok" and keep_source else None
+            return status, max(delay - 1, 1), source
 
         except Exception as e:
             error_msg = str(e).lower()
@@ -202,6 +394,235 @@ def check_url(driver: uc.Chrome, url: str, delay: int, keywords: List[str], retr
 
     return "error: UnknownError", delay, None
 
+def wait_for_page(driver: uc.Chrome, deadline: float) -> bool:
+    """
+    Waits until the current tab has finished loading. Returns False on timeout
+    or when Chrome shows its own error page instead of the site.
+    """
+    while driver.execute_script("return document.readyState") != "complete":
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.2)
+    return not driver.execute_script("return document.URL").startswith("chrome-error://")
+
+def check_urls_in_tabs(driver: uc.Chrome, urls: List[str], delay: int, timeout: int, keywords: List[str], retries: int = 3, keep_source: bool = True, waf_streak: int = 0, block_css: bool = False) -> List[Tuple[str, int, Optional[str]]]:
+    """
+    Opens the URLs together in background tabs of one browser so their page
+    loads overlap, then classifies each tab like check_url. Each tab gets the
+    same resource block as the main one before it starts loading. URLs whose tab did
+    not settle (load timeout, browser error page, WAF challenge) are re-checked
+    one at a time with check_url, which handles retries and error statuses.
+    Returns one (status, delay, source) tuple per URL, in order.
+    """
+    # Any failure below leaves URLs without a page, to be re-checked with
+    # check_url, rather than taking the worker down
+    pages = [None] * len(urls)
+    handles = []
+    main_window = None
+    try:
+        main_window = driver.current_window_handle
+        # ChromeDriver window handles are the DevTools target ids
+        for url in urls:
+            handle = driver.execute_cdp_cmd("Target.createTarget", {"url": "about:blank", "newWindow": False, "background": True})["targetId"]
+            handles.append(handle)
+            driver.switch_to.window(handle)
+            block_resources(driver, block_css)
+            # Returns once the navigation starts, so the loads still overlap
+            driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        deadline = time.monotonic() + timeout
+        if waf_streak:
+            time.sleep(random.uniform(0, delay))
+
+        for index, handle in enumerate(handles):
+            try:
+                driver.switch_to.window(handle)
+                if wait_for_page(driver, deadline):
+                    status = classify_page(sniff_page(driver), keywords)
+                    source = driver.page_source.strip() if status == "ok" and keep_source else None
+                    pages[index] = (status, source)
+            except Exception:
+                pass
+    except Exception:
+        pass
+
+    for handle in handles:
+        try:
+            driver.execute_cdp_cmd("Target.closeTarget", {"targetId": handle})
+        except Exception:
+            pass
+    try:
+        driver.switch_to.window(main_window or driver.window_handles[0])
+    except Exception:
+        pass  # check_url reports the errors if no window is left
+    return settle_batch(driver, urls, pages, delay, keywords, retries, keep_source, waf_streak)
+
+def check_urls_by_fetch(driver: uc.Chrome, urls: List[str], delay: int, timeout: int, keywords: List[str], retries: int = 3, keep_source: bool = True, waf_streak: int = 0) -> List[Tuple[str, int, Optional[str]]]:
+    """
+    Fetches the URLs with fetch() from a page on their own origin instead of
+    navigating to each, so one WebDriver call covers all URLs of an origin and
+    the requests carry the browser's cookies. Responses are classified like
+    the HTTP probe's; URLs it cannot settle (WAF challenges, JavaScript-only
+    pages, network or CORS errors) are re-checked one at a time with check_url.
+    Returns one (status, delay, source) tuple per URL, in order.
+    """
+    origins = {}
+    for index, url in enumerate(urls):
+        origins.setdefault(url_origin(url), []).append(index)
+    if waf_streak:
+        time.sleep(random.uniform(0, delay))
+
+    pages = [None] * len(urls)
+    for origin, indexes in origins.items():
+        if origin is None:
+            continue
+        try:
+            driver.set_script_timeout(timeout)
+            # fetch() is only allowed same-origin, so run it from the origin itself
+            if url_origin(driver.current_url) != origin:
+                driver.get(origin + "/")
+                # Redirected elsewhere (http -> https, apex -> www): fetching
+                # from there would only fail on CORS, so load URLs one by one
+                if url_origin(driver.current_url) != origin:
+                    continue
+            responses = driver.execute_async_script(FETCH_SCRIPT, [urls[i] for i in indexes], keep_source, HTTP_SNIFF_BYTES)
+        except Exception:
+            continue  # Re-checked with check_url below
+        for index, response in zip(indexes, responses):
+            if not response:
+                continue
+            status = classify_response(response["status"], response["mitigated"], response["text"][:HTTP_SNIFF_BYTES], keywords)
+            if status not in BROWSER_STATUSES:
+                pages[index] = (status, response["text"].strip() if status == "ok" and keep_source else None)
+    return settle_batch(driver, urls, pages, delay, keywords, retries, keep_source, waf_streak)
+
+def settle_batch(driver: uc.Chrome, urls: List[str], pages: List[Optional[Tuple[str, Optional[str]]]], delay: int, keywords: List[str], retries: int = 3, keep_source: bool = True, waf_streak: int = 0) -> List[Tuple[str, int, Optional[str]]]:
+    """
+    Turns the (status, source) pages of a batch check into (status, delay,
+    source) results, re-checking URLs without a page (None) with check_url.
+    """
+    results = []
+    for url, page in zip(urls, pages):
+        status, source = page if page else (None, None)
+        if status is None:
+            results.append(check_url(driver, url, delay, keywords, retries, keep_source, waf_streak))
+        elif status == "empty_response":
+            results.append((status, delay, None))
+        else:
+            results.append((status, max(delay - 1, 1), source))
+        delay = results[-1][1]
+    return results
+
+def check_url_remote(stream, url: str, delay: int, keywords: List[str], retries: int = 3, keep_source: bool = True, waf_streak: int = 0) -> Tuple[str, int, Optional[str]]:
+    """
+    Checks a URL on a browser held by pool_daemon.py, over an open connection
+    to its socket. Returns the same (status, delay, source) tuple as check_url.
+    """
+    request = {"url": url, "delay": delay, "keywords": keywords, "retries": retries, "keep_source": keep_source, "waf_streak": waf_streak}
+    stream.write(json.dumps(request).encode() + b"\n")
+    stream.flush()
+    reply = json.loads(stream.readline())
+    return reply["status"], reply["delay"], reply["source"]
+
+# ────────────────────────────────────────────────────────────────────────────────
+# DNS and HTTP Probing
+# ────────────────────────────────────────────────────────────────────────────────
+
+async def resolve_host(host: str) -> Tuple[bool, Optional[str]]:
+    """
+    Resolves a host to (exists, address). exists is False only when DNS says
+    the host does not exist; address is None whenever the lookup failed.
+    """
+    try:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except socket.gaierror as e:
+        return e.errno not in DEAD_HOST_ERRORS, None
+    except UnicodeError:
+        return True, None  # Left for the browser to report
+    return True, infos[0][4][0]
+
+async def resolve_hosts(hosts: List[str]) -> Tuple[set, dict]:
+    """
+    Resolves the hosts concurrently. Returns the hosts that do not exist and
+    an address for each host that resolved.
+    """
+    resolved = await asyncio.gather(*(resolve_host(host) for host in hosts))
+    dead_hosts = {host for host, (exists, _) in zip(hosts, resolved) if not exists}
+    addresses = {host: address for host, (_, address) in zip(hosts, resolved) if address}
+    return dead_hosts, addresses
+
+def host_resolver_rules(addresses: dict) -> str:
+    """
+    Builds a Chrome --host-resolver-rules value that maps each host to its
+    already resolved address, so the browser does not look it up again.
+    """
+    rules = []
+    for host, address in addresses.items():
+        if host == address or "%" in address:
+            continue  # IP literals need no rule; scoped IPv6 cannot be mapped
+        rules.append(f"MAP {host} [{address}]" if ":" in address else f"MAP {host} {address}")
+    return ", ".join(rules)
+
+def classify_response(status_code: int, mitigated: Optional[str], text: str, keywords: List[str]) -> str:
+    """
+    Classifies a plain HTTP response, given its status code, cf-mitigated
+    header and the start of its body, like classify_page does a loaded page.
+    Returns "waf_blocked" for challenge pages and "js_required" for pages that
+    only render with JavaScript; both need a browser to settle.
+    """
+    if status_code == 404:
+        return "not_found"
+    if mitigated == "challenge" or HTTP_CHALLENGE_RE.search(text):
+        return "waf_blocked"
+    if JS_REQUIRED_RE.search(text):
+        return "js_required"
+    title = TITLE_RE.search(text)
+    if is_not_found(title.group(1).strip() if title else "", text.strip()[:100], keywords):
+        return "not_found"
+    return "ok"
+
+async def http_probe(client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str, keywords: List[str], keep_source: bool = True) -> Tuple[str, Optional[str]]:
+    """
+    Fetches a URL without a browser and returns (status, source). Only the
+    first HTTP_SNIFF_BYTES of the body are read to classify it; the rest is
+    read only for "ok" pages, and only when keep_source is set.
+    """
+    async with semaphore:
+        try:
+            async with client.stream("GET", url) as response:
+                body = bytearray()
+                chunks = response.aiter_bytes()
+                if response.status_code != 404:
+                    async for chunk in chunks:
+                        body += chunk
+                        if len(body) >= HTTP_SNIFF_BYTES:
+                            break
+                text = body.decode(response.encoding, "replace")
+                status = classify_response(response.status_code, response.headers.get("cf-mitigated"), text, keywords)
+                if status != "ok" or not keep_source:
+                    return status, None
+                async for chunk in chunks:
+                    body += chunk
+                return status, body.decode(response.encoding, "replace")
+        except httpx.RemoteProtocolError:
+            return "empty_response", None
+        except Exception as e:
+            return f"error: {type(e).__name__}", None
+
+async def http_probe_all(urls: List[str], timeout: int, keywords: List[str], keep_source: bool = True) -> List[Tuple[str, Optional[str]]]:
+    """
+    Probes all URLs concurrently over one HTTP/2-capable client, at most
+    HTTP_CONCURRENCY at a time. Returns one (status, source) tuple per URL.
+    """
+    semaphore = asyncio.Semaphore(HTTP_CONCURRENCY)
+    async with httpx.AsyncClient(
+        http2=True,
+        verify=False,
+        follow_redirects=True,
+        timeout=timeout,
+        headers={"User-Agent": HTTP_USER_AGENT},
+    ) as client:
+        return await asyncio.gather(*(http_probe(client, semaphore, url, keywords, keep_source) for url in urls))
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Output Helpers
 # ────────────────────────────────────────────────────────────────────────────────
@@ -216,34 +637,131 @@ def url_to_filename(url: str) -> str:
     hashed = hashlib.md5(url.encode()).hexdigest()[:8]
     return f"{base}_{hashed}.html"
 
-def save_valid_url(output_file: str, url: str):
+def save_valid_url(output: TextIO, url: str):
     """
-    Appends a valid URL to the output file.
+    Appends a valid URL to the open output file.
     """
-    with open(output_file, "a", encoding="utf-8") as f:
-        f.write(url + "\n")
+    output.write(url + "\n")
 
-def save_html(html_dir: str, url: str, source: str, saved_hashes: set, verbose=False):
+def save_html(html_dir: str, url: str, source: str, writes: queue.Queue):
     """
-    Saves HTML source to a file unless the content has already been saved (by hash).
+    Queues HTML source for html_writer. Blocks while the queue is full.
     """
-    content_hash = hashlib.md5(source.encode()).hexdigest()
-    if content_hash in saved_hashes:
-        return
-    saved_hashes.add(content_hash)
+    writes.put((os.path.join(html_dir, url_to_filename(url)), source))
 
-    os.makedirs(html_dir, exist_ok=True)
-    filename = url_to_filename(url)
-    filepath = os.path.join(html_dir, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        f.write(source)
-    if verbose:
-        logging.info(f"  [↓] HTML saved to: {filepath}")
+def html_writer(writes: queue.Queue, verbose=False):
+    """
+    Writer thread: saves queued (filepath, source) pairs until it receives
+    None, skipping content that was already saved (by hash). Encoding,
+    hashing and writing all happen here, off the main loop.
+    """
+    saved_hashes = set()
+    for filepath, source in iter(writes.get, None):
+        data = source.encode("utf-8", "replace")
+        content_hash = blake3.blake3(data).digest(16)
+        if content_hash in saved_hashes:
+            continue
+        saved_hashes.add(content_hash)
+        try:
+            with open(filepath, "wb") as f:
+                f.write(data)
+        except OSError as e:
+            # Keep draining, or the main loop would block on a full queue
+            logging.error(f"[!] ERROR saving HTML to {filepath}: {e}")
+            continue
+        if verbose:
+            logging.info(f"  [↓] HTML saved to: {filepath}")
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Main Processing Logic
 # ────────────────────────────────────────────────────────────────────────────────
 
+class PrefixPathState:
+    """
+    What the main loop knows about one prefix + path: its last status and how
+    many times in a row it was seen, the conclusive status later URLs reuse,
+    and whether later URLs are skipped.
+    """
+    __slots__ = ("last_status", "run_length", "cached", "skipped")
+
+    def __init__(self):
+        self.last_status = None
+        self.run_length = 0
+        self.cached = None
+        self.skipped = False
+
+def browser_worker(
+    tasks: Queue,
+    results: Queue,
+    delay: int,
+    timeout: int,
+    keywords: List[str],
+    driver_path: Optional[str] = None,
+    retries: int = 3,
+    tabs: int = 1,
+    pool_socket: Optional[str] = None,
+    keep_source: bool = True,
+    driver_options: Optional[dict] = None,
+    in_page_fetch: bool = False,
+):
+    """
+    Worker process: owns one Chrome instance and checks (task_id, url) items
+    from its own task queue until it receives None. Each result is put back as
+    (task_id, status, delay, source). With tabs > 1, up to that many queued
+    URLs are loaded together in background tabs, or with in_page_fetch,
+    fetched together from a page on their origin. With a pool socket, URLs are
+    checked on the daemon's pre-warmed browsers instead of a local Chrome,
+    otherwise driver_options are passed on to setup_driver.
+    Page sources are only sent back when keep_source is set. Each worker
+    counts its own run of "waf_blocked" results to decide when to slow down.
+    """
+    # The parent drains every result before sending None; if it bails out
+    # early instead, exiting must not block on unread results.
+    results.cancel_join_thread()
+    waf_streak = 0
+    if pool_socket:
+        with socket.socket(socket.AF_UNIX) as sock:
+            sock.connect(pool_socket)
+            stream = sock.makefile("rwb")
+            for task_id, url in iter(tasks.get, None):
+                status, delay, source = check_url_remote(stream, url, delay, keywords, retries, keep_source, waf_streak)
+                waf_streak = waf_streak + 1 if status == "waf_blocked" else 0
+                results.put((task_id, status, delay, source))
+        return
+
+    driver_copy = copy_driver(driver_path if driver_path else DEFAULT_DRIVER_PATH)
+    try:
+        driver = setup_driver(timeout, driver_copy, **(driver_options or {}))
+        try:
+            done = False
+            while not done:
+                batch = [tasks.get()]
+                while batch[-1] is not None and len(batch) < tabs:
+                    try:
+                        batch.append(tasks.get_nowait())
+                    except queue.Empty:
+                        break
+                # The parent sends None only once nothing else is queued
+                done = batch[-1] is None
+                if done:
+                    batch.pop()
+                if not batch:
+                    continue
+                if in_page_fetch:
+                    checked = check_urls_by_fetch(driver, [url for _, url in batch], delay, timeout, keywords, retries, keep_source, waf_streak)
+                elif tabs > 1:
+                    block_css = (driver_options or {}).get("block_css", False)
+                    checked = check_urls_in_tabs(driver, [url for _, url in batch], delay, timeout, keywords, retries, keep_source, waf_streak, block_css)
+                else:
+                    checked = [check_url(driver, batch[0][1], delay, keywords, retries, keep_source, waf_streak)]
+                for (task_id, _), (status, delay, source) in zip(batch, checked):
+                    waf_streak = waf_streak + 1 if status == "waf_blocked" else 0
+                    results.put((task_id, status, delay, source))
+        finally:
+            driver.quit()
+    finally:
+        shutil.rmtree(os.path.dirname(driver_copy), ignore_errors=True)
+
 def process_urls(
     urls: List[str],
     delay: int,
@@ -254,60 +772,202 @@ def process_urls(
     retries: int = 3,
     html_dump_dir: Optional[str] = None,
     args=None,
+    workers: int = 1,
+    tabs: int = 1,
+    pool_socket: Optional[str] = None,
+    http_probe: bool = False,
+    http_only: bool = False,
+    driver_options: Optional[dict] = None,
+    pin_dns: bool = False,
+    in_page_fetch: bool = False,
 ):
     """
-    Main loop: visits each URL and tracks repeated failures per prefix + path.
-    Skips further checks for a path if same failure status appears 3 times.
+    Main loop: hands URLs to a pool of browser processes and tracks repeated
+    failures per prefix + path. Skips further checks for a path if same failure
+    status appears 3 times, and reuses a conclusive status for later URLs with
+    the same prefix + path instead of loading them again.
+
+    At most one URL per browser tab is in flight, and the skip check runs only
+    once a slot is free, so it sees every result that came back before it.
+    With a single worker and tab this is exactly the sequential order. If a
+    worker crashes, its in-flight URLs are recorded as "error: WorkerExited"
+    and the remaining workers carry on.
+
+    URLs on hosts that do not resolve are recorded as "dns_error" up front.
+    With http_probe, all URLs are first fetched over plain HTTP and only those
+    the probe cannot settle (WAF challenges, JavaScript-only pages, errors) go
+    to a browser. With http_only, probe results are final and no browser runs.
+    With in_page_fetch, browsers fetch() their batches instead of loading pages.
     """
-    driver = setup_driver(timeout, driver_path)
-    try:
-        prefix_path_status = defaultdict(lambda: deque(maxlen=3))
-        skipped_prefix_path = set()
-        saved_hashes = set()
+    # Parsed once here: URLs with the same prefix + path share one state
+    # object, so the main loop does no key hashing. None marks skipped paths.
+    path_states = {}
+    url_states = {}
+    url_hosts = {}
+    for url in urls:
+        parsed = urlparse(url)
+        prefix_path_key = url_key(parsed, SKIP_PATTERNS)
+        if prefix_path_key is not None:
+            url_hosts[url] = parsed.hostname
+            if prefix_path_key not in path_states:
+                path_states[prefix_path_key] = PrefixPathState()
+        url_states[url] = path_states.get(prefix_path_key)
+    hosts = list(set(filter(None, url_hosts.values())))
+    logging.info(f"[*] Resolving {len(hosts)} hosts")
+    dead_hosts, addresses = asyncio.run(resolve_hosts(hosts))
+    # URLs settled without a browser: dead hosts, then anything the HTTP probe settles
+    probed = {url: ("dns_error", None) for url, host in url_hosts.items() if host in dead_hosts}
+    if http_probe or http_only:
+        candidates = [url for url in url_hosts if url not in probed]
+        logging.info(f"[*] Probing {len(candidates)} URLs over HTTP")
+        outcomes = asyncio.run(http_probe_all(candidates, timeout, keywords, bool(html_dump_dir)))
+        probed.update(
+            (url, outcome) for url, outcome in zip(candidates, outcomes)
+            if http_only or not (outcome[0] in BROWSER_STATUSES or outcome[0].startswith("error"))
+        )
+
+    # Line-buffered: each valid URL reaches the file as soon as it is found
+    output = open(output_file, "a", encoding="utf-8", buffering=1) if output_file else None
+    if html_dump_dir:
+        os.makedirs(html_dump_dir, exist_ok=True)
+
+    # The daemon's browsers are already running, so only local ones are pinned
+    if pin_dns and not pool_socket:
+        driver_options = dict(driver_options or {}, host_rules=host_resolver_rules(addresses))
+
+    # Chrome is only started when some URL still needs a browser
+    needs_browser = any(url not in probed for url in url_hosts)
+    workers = max(1, min(os.cpu_count() or 1, workers)) if needs_browser else 0
+    # The daemon checks one URL per request, so tabs and in-page fetch only apply locally
+    tabs = 1 if pool_socket else max(1, tabs)
+    # One task queue per worker, so the URLs a crashed worker held are known
+    tasks, results = [Queue() for _ in range(workers)], Queue()
+    pool = [
+        Process(target=browser_worker, args=(tasks[worker], results, delay, timeout, keywords, driver_path, retries, tabs, pool_socket, bool(html_dump_dir), driver_options, in_page_fetch))
+        for worker in range(workers)
+    ]
+    for process in pool:
+        process.start()
+
+    # Bounded so a slow disk holds up the loop instead of piling up pages
+    writes = queue.Queue(maxsize=64)
+    writer = threading.Thread(target=html_writer, args=(writes, args.verbose))
+    if html_dump_dir:
+        writer.start()
+
+    in_flight = {}
+    loads = [0] * workers
+    live = set(range(workers))
+
+    def record_result(url, state, status, source):
+        if status == state.last_status:
+            state.run_length += 1
+        else:
+            state.last_status, state.run_length = status, 1
+        if status in CACHEABLE_STATUSES:
+            state.cached = status
+
+        if status == "ok":
+            if output:
+                save_valid_url(output, url)
+            if html_dump_dir and source:
+                save_html(html_dump_dir, url, source, writes)
+
+    def drop_dead_workers() -> bool:
+        """
+        Records the URLs held by crashed workers as failed. Returns True if
+        that settled any in-flight URL.
+        """
+        settled = False
+        for worker in sorted(live):
+            if pool[worker].is_alive():
+                continue
+            live.discard(worker)
+            lost = [task_id for task_id, (_, _, owner) in in_flight.items() if owner == worker]
+            logging.error(f"[!] Browser worker {worker} exited unexpectedly with {len(lost)} URLs in flight")
+            for task_id in lost:
+                url, state, _ = in_flight.pop(task_id)
+                record_result(url, state, "error: WorkerExited", None)
+                settled = True
+        if not live:
+            logging.error("[!] All browser workers exited unexpectedly")
+            sys.exit(1)
+        return settled
+
+    def collect_result():
+        while True:
+            try:
+                task_id, status, next_delay, source = results.get(timeout=1)
+                break
+            except queue.Empty:
+                if drop_dead_workers():
+                    return
+        url, state, worker = in_flight.pop(task_id)
+        loads[worker] -= 1
+
+        if args.verbose:
+            logging.info(f"  [!] Status: {status} ({url})")
+            logging.info(f"  [~] Next delay: {next_delay} seconds")
+
+        record_result(url, state, status, source)
 
+    try:
         iterator = enumerate(urls, 1)
         if not args.verbose:
             iterator = tqdm(iterator, total=len(urls), desc="Checking URLs", unit="url")
 
         for idx, url in iterator:
-            if should_skip_path(url, SKIP_PATTERNS):
+            state = url_states[url]
+            if state is None or state.skipped:
                 continue
 
-            common_prefix = get_common_prefix(url)
-            path_no_query = get_path_without_query(url)
-            
-            prefix_path_key = (common_prefix, path_no_query)
-            
-            # logging.info(f"[~] Prefix/Path: {prefix_path_key}")
+            while in_flight and len(in_flight) >= len(live) * tabs:
+                collect_result()
+
+            if state.run_length >= 3:
+                state.skipped = True
+                if args.verbose:
+                    logging.info(f"[!] Skipping {url} due to 3x '{state.last_status}' for prefix/path.")
+                continue
 
-            if prefix_path_key in skipped_prefix_path:
+            # Same prefix + path as a URL already checked: reuse its outcome.
+            # The URL is never loaded, so it gets no HTML dump of its own; only
+            # the first URL of each prefix + path is dumped, even when another
+            # query string would have returned a different page.
+            if state.cached:
+                if args.verbose:
+                    logging.info(f"[{idx}/{len(urls)}] Reusing '{state.cached}' for same prefix/path: {url}")
+                record_result(url, state, state.cached, None)
                 continue
 
-            recent = prefix_path_status[prefix_path_key]
-            if len(recent) == 3 and len(set(recent)) == 1:
-                skipped_prefix_path.add(prefix_path_key)
+            if url in probed:
+                status, source = probed.pop(url)
                 if args.verbose:
-                    logging.info(f"[!] Skipping {url} due to 3x '{recent[0]}' for prefix/path.")
+                    logging.info(f"[{idx}/{len(urls)}] Settled without a browser: {status} ({url})")
+                record_result(url, state, status, source)
                 continue
 
             if args.verbose:
                 logging.info(f"[{idx}/{len(urls)}] Visiting: {url}")
 
-            status, delay, source = check_url(driver, url, delay, keywords, retries)
-            prefix_path_status[prefix_path_key].append(status)
-
-            if args.verbose:
-                logging.info(f"  [!] Status: {status}")
-                logging.info(f"  [~] Next delay: {delay} seconds")
+            worker = min(live, key=loads.__getitem__)
+            loads[worker] += 1
+            in_flight[idx] = (url, state, worker)
+            tasks[worker].put((idx, url))
 
-            if status == "ok":
-                if output_file:
-                    save_valid_url(output_file, url)
-                if html_dump_dir and source:
-                    save_html(html_dump_dir, url, source, saved_hashes, args.verbose)
+        while in_flight:
+            collect_result()
 
     finally:
-        driver.quit()
+        for worker_tasks in tasks:
+            worker_tasks.put(None)
+        for process in pool:
+            process.join()
+        if writer.is_alive():
+            writes.put(None)
+            writer.join()
+        if output:
+            output.close()
 
 def main():
     """
@@ -317,6 +977,9 @@ def main():
     setup_logging(args.verbose)
     keywords = [kw.strip() for kw in args.not_found_keywords.split(",")] if args.not_found_keywords else DEFAULT_NOT_FOUND_KEYWORDS
     urls = load_urls(args.input)
+    pool_socket = os.environ.get(POOL_SOCKET_ENV)
+    if pool_socket:
+        logging.info(f"[*] Using browser pool at {pool_socket}")
     process_urls(
         urls=urls,
         delay=args.delay,
@@ -327,6 +990,14 @@ def main():
         retries=args.retries,
         html_dump_dir=args.html_dump_dir,
         args=args,
+        workers=args.workers,
+        tabs=args.tabs,
+        pool_socket=pool_socket,
+        http_probe=args.http_probe,
+        http_only=args.http_only,
+        driver_options={"block_css": args.block_css, "headless": args.headless, "browser_path": args.browser_path},
+        pin_dns=args.pin_dns,
+        in_page_fetch=args.in_page_fetch,
     )
 
 if __name__ == "__main__":
@@ -1,17 +1,37 @@
 import argparse
-import requests
-import xml.etree.ElementTree as ET
-import time
+import asyncio
+import httpx
 import logging
-import gzip
-import io
 import re
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from threading import Lock
+import zlib
+from lxml import etree
 
-checked_sitemaps = set()
-all_urls = set()
-lock = Lock()
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept": "application/xml, text/xml;q=0.9, */*;q=0.8",
+}
+
+# Input lines that look like sitemaps: anything ending in .xml / .xml.gz, or
+# a "sitemap...xml" URL with a query string or fragment after it
+SITEMAP_RE = re.compile(r"sitemap.*\.xml", re.IGNORECASE)
+
+
+class CrawlState:
+    # Dedup sets and URL cap of one crawl, passed to each fetch instead of
+    # living at module level, so separate crawls never share them
+    def __init__(self, max_urls):
+        self.checked_sitemaps = set()
+        self.urls = set()
+        self.max_urls = max_urls
+        self.limit_reached = asyncio.Event()
+
+    def full(self):
+        return len(self.urls) >= self.max_urls
+
+
+def is_sitemap_url(url):
+    # Plain suffix check first; the regex only runs for the odd ones out
+    return url.lower().endswith((".xml", ".xml.gz")) or bool(SITEMAP_RE.search(url))
 
 
 def get_namespace(tag):
@@ -20,57 +40,89 @@ def get_namespace(tag):
     return ""
 
 
-def fetch_sitemap_urls(
-    sitemap_url, depth, max_depth, max_urls, timeout, delay, retries
+async def iter_body(response, gzipped):
+    # Gunzips .gz sitemaps chunk by chunk, member after member like
+    # gzip.decompress, so the whole file is never held in memory
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    async for chunk in response.aiter_bytes():
+        if not gzipped:
+            yield chunk
+            continue
+        while chunk:
+            yield decompressor.decompress(chunk)
+            chunk = decompressor.unused_data
+            if decompressor.eof:
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+async def iter_locs(chunks):
+    # Yields ("url" | "sitemap", loc) for each entry directly under the root,
+    # parsing chunks as they arrive and dropping parsed entries so large
+    # sitemaps are never held whole
+    parser = etree.XMLPullParser(events=("start", "end"), resolve_entities=False)
+    root, kinds, loc_tag = None, {}, None
+
+    def read_entries():
+        nonlocal root, kinds, loc_tag
+        for event, elem in parser.read_events():
+            if root is None:
+                root = elem
+                namespace_uri = get_namespace(root.tag)
+                prefix = f"{{{namespace_uri}}}" if namespace_uri else ""
+                kinds = {prefix + "url": "url", prefix + "sitemap": "sitemap"}
+                loc_tag = prefix + "loc"
+            elif event == "end" and elem.getparent() is root:
+                kind = kinds.get(elem.tag)
+                if kind:
+                    loc = elem.find(loc_tag)
+                    if loc is not None and loc.text:
+                        yield kind, loc.text.strip()
+                elem.clear()
+                while elem.getprevious() is not None:
+                    del root[0]
+
+    async for chunk in chunks:
+        parser.feed(chunk)
+        for entry in read_entries():
+            yield entry
+    parser.close()
+    for entry in read_entries():
+        yield entry
+
+
+async def fetch_sitemap_urls(
+    client, state, sitemap_url, depth, max_depth, delay, retries
 ):
-    with lock:
-        if sitemap_url in checked_sitemaps or len(all_urls) >= max_urls:
-            return
-        checked_sitemaps.add(sitemap_url)
-
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0",
-        "Accept": "application/xml, text/xml;q=0.9, */*;q=0.8",
-    }
+    # Runs on one event loop, so check-and-add needs no lock
+    if sitemap_url in state.checked_sitemaps or state.full():
+        return
+    state.checked_sitemaps.add(sitemap_url)
 
     for attempt in range(1, retries + 1):
         try:
-            time.sleep(delay)
-            response = requests.get(sitemap_url, headers=headers, timeout=timeout)
+            await asyncio.sleep(delay)
+            async with client.stream("GET", sitemap_url) as response:
+                if response.status_code != 200:
+                    logging.error(
+                        f"Failed to fetch {sitemap_url} (HTTP {response.status_code})"
+                    )
+                    return
 
-            if response.status_code != 200:
-                logging.error(
-                    f"Failed to fetch {sitemap_url} (HTTP {response.status_code})"
-                )
-                return
-
-            raw_content = response.content
-            content_type = response.headers.get("Content-Type", "")
-            if "gzip" in content_type or sitemap_url.endswith(".gz"):
-                raw_content = gzip.decompress(raw_content)
-
-            root = ET.fromstring(raw_content)
-            namespace_uri = get_namespace(root.tag)
-            ns = {"ns": namespace_uri} if namespace_uri else {}
-
-            # Add URLs
-            for tag in root.findall("ns:url", ns):
-                loc = tag.find("ns:loc", ns)
-                if loc is not None and loc.text:
-                    url = loc.text.strip()
-                    with lock:
-                        if url not in all_urls and len(all_urls) < max_urls:
-                            all_urls.add(url)
-
-            # Find nested sitemaps
-            nested = []
-            for tag in root.findall("ns:sitemap", ns):
-                loc = tag.find("ns:loc", ns)
-                if loc is not None and loc.text:
-                    nested_url = loc.text.strip()
-                    logging.info(f"Depth {depth} -> Nested: {nested_url}")
-                    if depth < max_depth:
-                        nested.append((nested_url, depth + 1))
+                content_type = response.headers.get("Content-Type", "")
+                gzipped = "gzip" in content_type or sitemap_url.endswith(".gz")
+
+                # Add URLs and find nested sitemaps
+                nested = []
+                async for kind, loc in iter_locs(iter_body(response, gzipped)):
+                    if kind == "url":
+                        # Stop reading this sitemap as soon as the cap is hit
+                        if state.full():
+                            return []
+                        state.urls.add(loc)
+                    else:
+                        logging.info(f"Depth {depth} -> Nested: {loc}")
+                        if depth < max_depth:
+                            nested.append((loc, depth + 1))
 
             return nested  # Return nested sitemaps for further processing
 
@@ -80,42 +132,57 @@ def fetch_sitemap_urls(
     logging.error(f"Failed to fetch {sitemap_url} after {retries} retries")
 
 
-def threaded_crawler(
-    sitemap_urls, max_depth, max_urls, timeout, delay, retries, threads
-):
-    queue = [(url, 0) for url in sitemap_urls]
-
-    with ThreadPoolExecutor(max_workers=threads) as executor:
-        futures = []
-
-        while queue:
-            current_batch = []
-            for url, depth in queue:
-                future = executor.submit(
-                    fetch_sitemap_urls,
-                    url,
-                    depth,
-                    max_depth,
-                    max_urls,
-                    timeout,
-                    delay,
-                    retries,
+async def crawl(sitemap_urls, max_depth, max_urls, timeout, delay, retries, threads):
+    state = CrawlState(max_urls)
+    queue = asyncio.Queue()
+    for url in sitemap_urls:
+        queue.put_nowait((url, 0))
+
+    # Each worker picks up nested sitemaps as soon as they are found, instead
+    # of waiting for the whole depth layer to finish
+    async def worker(client):
+        while True:
+            url, depth = await queue.get()
+            try:
+                nested = await fetch_sitemap_urls(
+                    client, state, url, depth, max_depth, delay, retries
                 )
-                futures.append(future)
-                current_batch.append(future)
-            queue = []  # clear queue for next nested layer
-
-            for future in as_completed(current_batch):
-                result = future.result()
-                if result:
-                    queue.extend(result)
-                if len(all_urls) >= max_urls:
-                    logging.warning("Max URL limit reached globally.")
-                    return
+                if state.full():
+                    state.limit_reached.set()
+                    continue
+                for item in nested or []:
+                    queue.put_nowait(item)
+            finally:
+                queue.task_done()
+
+    async with httpx.AsyncClient(
+        headers=HEADERS,
+        timeout=timeout,
+        follow_redirects=True,
+        # Sitemaps of one site share a host: keep connections alive and let
+        # HTTP/2 servers multiplex the nested fetches over a single socket
+        http2=True,
+        limits=httpx.Limits(max_connections=threads, max_keepalive_connections=threads),
+    ) as client:
+        workers = [asyncio.create_task(worker(client)) for _ in range(threads)]
+        # Finish when the queue drains or, earlier, when the URL cap is hit;
+        # cancelling the workers then drops fetches still in flight
+        waiters = [
+            asyncio.create_task(queue.join()),
+            asyncio.create_task(state.limit_reached.wait()),
+        ]
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+        for task in workers + waiters:
+            task.cancel()
+        await asyncio.gather(*workers, *waiters, return_exceptions=True)
+
+    if state.full():
+        logging.warning("Max URL limit reached globally.")
+    return state
 
 
 def main():
-    parser = argparse.ArgumentParser(description="Fast threaded sitemap parser")
+    parser = argparse.ArgumentParser(description="Fast concurrent sitemap parser")
     parser.add_argument("-i", "--input", required=True, help="File with sitemap URLs")
     parser.add_argument(
         "-o", "--output", required=True, help="File to save extracted URLs"
@@ -128,10 +195,12 @@ def main():
     )
     parser.add_argument("--timeout", type=int, default=10, help="Timeout per request")
     parser.add_argument(
-        "--delay", type=float, default=0.2, help="Delay per request (per thread)"
+        "--delay", type=float, default=0.2, help="Delay per request (per worker)"
     )
     parser.add_argument("--retries", type=int, default=2, help="Retry attempts")
-    parser.add_argument("--threads", type=int, default=10, help="Number of threads")
+    parser.add_argument(
+        "--threads", type=int, default=10, help="Number of concurrent requests"
+    )
     parser.add_argument("--verbose", action="store_true", help="Verbose logging")
     args = parser.parse_args()
 
@@ -142,13 +211,7 @@ def main():
 
     try:
         with open(args.input, "r", encoding="utf-8", errors="replace") as f:
-            sitemap_urls = [
-                line.strip()
-                for line in f
-                if re.search(
-                    r"(sitemap.*\.xml|\.xml(\.gz)?$)", line.strip(), re.IGNORECASE
-                )
-            ]
+            sitemap_urls = [url for line in f if is_sitemap_url(url := line.strip())]
     except Exception as e:
         logging.error(f"Error reading input: {e}")
         return
@@ -157,22 +220,24 @@ def main():
         logging.error("No valid sitemap URLs found.")
         return
 
-    threaded_crawler(
-        sitemap_urls,
-        args.max_depth,
-        args.max_urls,
-        args.timeout,
-        args.delay,
-        args.retries,
-        args.threads,
+    state = asyncio.run(
+        crawl(
+            sitemap_urls,
+            args.max_depth,
+            args.max_urls,
+            args.timeout,
+            args.delay,
+            args.retries,
+            args.threads,
+        )
     )
 
     try:
         with open(args.output, "w") as out:
-            for url in sorted(all_urls):
+            for url in sorted(state.urls):
                 out.write(url + "\n")
-        logging.info(f"[+] Done. {len(all_urls)} URLs saved to {args.output}")
-        logging.info(f"[+] {len(checked_sitemaps)} sitemaps checked.")
+        logging.info(f"[+] Done. {len(state.urls)} URLs saved to {args.output}")
+        logging.info(f"[+] {len(state.checked_sitemaps)} sitemaps checked.")
     except Exception as e:
         logging.error(f"Error writing output: {e}")
 
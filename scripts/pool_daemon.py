@@ -0,0 +1,206 @@
+"""
+Browser Pool Daemon for parse_endpoint.py
+
+Keeps a set of pre-warmed undetected-chromedriver instances alive between
+runs so URL checks skip Chrome's cold start. parse_endpoint.py uses the pool
+when RECON_POOL_SOCKET points at this daemon's Unix socket.
+
+Protocol: one JSON object per line in each direction. A request is
+{"url", "delay", "keywords", "retries", "keep_source", "waf_streak"}, the
+arguments of check_url; the reply is {"status", "delay", "source"}, as
+returned by check_url.
+"""
+
+import os
+import sys
+import json
+import queue
+import shutil
+import logging
+import argparse
+import socketserver
+from typing import Optional
+
+from parse_endpoint import (
+    DEFAULT_DRIVER_PATH,
+    POOL_SOCKET_ENV,
+    check_url,
+    copy_driver,
+    setup_driver,
+    setup_logging,
+)
+
+# A browser is restarted after this many checks to shed leaked memory
+MAX_USES_PER_INSTANCE = 200
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Argument Parsing
+# ────────────────────────────────────────────────────────────────────────────────
+
+def parse_args():
+    """
+    Parses command-line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Serve pre-warmed Chrome instances to parse_endpoint.py.")
+    parser.add_argument("-s", "--socket", default=os.environ.get(POOL_SOCKET_ENV), help=f"Unix socket path (default: ${POOL_SOCKET_ENV})")
+    parser.add_argument("-n", "--size", type=int, default=2, help="Number of browsers to keep (default: 2)")
+    parser.add_argument("--timeout", type=int, default=10, help="Page load timeout in seconds (default: 10)")
+    parser.add_argument("--driver-path", type=str, help=f"Path to ChromeDriver (default: {DEFAULT_DRIVER_PATH})")
+    parser.add_argument("--block-css", action="store_true", help="Also block stylesheets (faster, but pages render unstyled)")
+    parser.add_argument("--headless", action="store_true", help="Run Chrome headless (faster, but easier for WAFs to spot)")
+    parser.add_argument("--browser-path", type=str, help="Chrome binary to use, e.g. chrome-headless-shell")
+    parser.add_argument("--profile-dir", type=str, help="Directory for per-browser profiles, so caches persist")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Enable verbose logging")
+    args = parser.parse_args()
+    if not args.socket:
+        parser.error(f"--socket or ${POOL_SOCKET_ENV} is required")
+    return args
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Browser Pool
+# ────────────────────────────────────────────────────────────────────────────────
+
+class PooledBrowser:
+    """
+    A pool slot and the Chrome instance in it, with its own driver copy.
+    driver is None while the slot waits to be (re)started.
+    """
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.driver = None
+        self.driver_copy = None
+        self.uses = 0
+
+    def quit(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+        if self.driver_copy:
+            shutil.rmtree(os.path.dirname(self.driver_copy), ignore_errors=True)
+            self.driver_copy = None
+
+class BrowserPool:
+    """
+    Holds pre-warmed browsers. acquire() blocks until one is free; release()
+    hands it back, quitting it once it has served MAX_USES_PER_INSTANCE checks
+    so the next acquire() of that slot restarts it. A slot whose restart fails
+    goes back to the pool and is retried by the next acquire(), so the pool
+    never shrinks. Each slot keeps the same profile directory across restarts.
+    """
+    def __init__(self, size: int, timeout: int, driver_path: Optional[str] = None, profile_dir: Optional[str] = None, driver_options: Optional[dict] = None):
+        self.timeout = timeout
+        self.driver_options = driver_options or {}
+        self.driver_path = driver_path if driver_path else DEFAULT_DRIVER_PATH
+        self.profile_dir = profile_dir
+        self.idle = queue.Queue()
+        # Every slot, checked out or not, so close() can quit them all
+        self.browsers = [PooledBrowser(slot) for slot in range(size)]
+        try:
+            for browser in self.browsers:
+                self.start(browser)
+                self.idle.put(browser)
+        except RuntimeError:
+            self.close()
+            raise
+
+    def start(self, browser: PooledBrowser):
+        """
+        Starts Chrome in a slot. Raises RuntimeError if it fails to start.
+        """
+        user_data_dir = os.path.join(self.profile_dir, f"slot{browser.slot}") if self.profile_dir else None
+        try:
+            browser.driver_copy = copy_driver(self.driver_path)
+            browser.driver = setup_driver(self.timeout, browser.driver_copy, user_data_dir, **self.driver_options)
+        except SystemExit:  # copy_driver and setup_driver log the error and exit
+            browser.quit()
+            raise RuntimeError(f"Browser in slot {browser.slot} failed to start")
+        browser.uses = 0
+        logging.info(f"[+] Browser ready in slot {browser.slot}")
+
+    def acquire(self) -> PooledBrowser:
+        browser = self.idle.get()
+        if browser.driver is None:
+            try:
+                self.start(browser)
+            except RuntimeError:
+                self.idle.put(browser)
+                raise
+        return browser
+
+    def release(self, browser: PooledBrowser):
+        browser.uses += 1
+        if browser.uses >= MAX_USES_PER_INSTANCE:
+            browser.quit()
+        self.idle.put(browser)
+
+    def close(self):
+        for browser in self.browsers:
+            browser.quit()
+
+# ────────────────────────────────────────────────────────────────────────────────
+# Socket Server
+# ────────────────────────────────────────────────────────────────────────────────
+
+class CheckHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one client connection: checks each requested URL on a pooled browser.
+    """
+    def handle(self):
+        for line in self.rfile:
+            reply = self.check(json.loads(line))
+            self.wfile.write(json.dumps(reply).encode() + b"\n")
+            self.wfile.flush()
+
+    def check(self, request: dict) -> dict:
+        pool = self.server.pool
+        try:
+            browser = pool.acquire()
+        except RuntimeError as e:
+            # Reported to the client as a failed check; the slot is retried later
+            logging.error(f"[!] {e}")
+            return {"status": f"error: {type(e).__name__}", "delay": request["delay"], "source": None}
+        try:
+            status, delay, source = check_url(
+                browser.driver, request["url"], request["delay"], request["keywords"], request["retries"],
+                request.get("keep_source", True), request.get("waf_streak", 0),
+            )
+        finally:
+            pool.release(browser)
+        logging.info(f"[{browser.slot}] {status}: {request['url']}")
+        return {"status": status, "delay": delay, "source": source}
+
+class PoolServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, pool: BrowserPool):
+        self.pool = pool
+        super().__init__(socket_path, CheckHandler)
+
+def main():
+    """
+    Entry point.
+    """
+    args = parse_args()
+    setup_logging(args.verbose)
+    if os.path.exists(args.socket):
+        os.remove(args.socket)
+
+    driver_options = {"block_css": args.block_css, "headless": args.headless, "browser_path": args.browser_path}
+    try:
+        pool = BrowserPool(args.size, args.timeout, args.driver_path, args.profile_dir, driver_options)
+    except RuntimeError as e:
+        logging.error(f"[!] {e}")
+        sys.exit(1)
+    try:
+        with PoolServer(args.socket, pool) as server:
+            print(f"[*] Browser pool ({args.size}) listening on {args.socket}")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+
+if __name__ == "__main__":
+    main()